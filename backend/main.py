@@ -1,24 +1,121 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import os
 import asyncio
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
 import json
-
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import hashlib
+import logging
 
 from services.youtube_service import YouTubeService
-from services.whisper_service import WhisperService
 from services.genius_service import GeniusService
 from services.cache_service import CacheService
-from services.audio_separation_service import AudioSeparationService
+from services.status_service import StatusService
+from services.executors import IO_EXECUTOR
 # from services.lyrics_alignment_service import LyricsAlignmentService  # TODO: Implement this service
 
-app = FastAPI(title="Karaoke Platform API")
+if TYPE_CHECKING:
+    # Imported lazily below: these pull in torch, Demucs and faster-whisper
+    from services.whisper_service import WhisperService
+    from services.audio_separation_service import AudioSeparationService
+
+logger = logging.getLogger(__name__)
+
+# Process-wide service singletons, built once in lifespan. The model-backed
+# services below are separate, so a worker that only serves /search can skip them.
+@lru_cache(maxsize=None)
+def get_youtube_service() -> YouTubeService:
+    return YouTubeService()
+
+@lru_cache(maxsize=None)
+def get_genius_service() -> GeniusService:
+    return GeniusService()
+
+@lru_cache(maxsize=None)
+def get_cache_service() -> CacheService:
+    return CacheService()
+
+@lru_cache(maxsize=None)
+def get_status_service() -> StatusService:
+    return StatusService()
+
+# Endpoint dependencies. They're async so FastAPI calls them on the event loop;
+# plain def dependencies would each cost a threadpool round trip per request.
+async def youtube_service_dependency() -> YouTubeService:
+    return get_youtube_service()
+
+async def cache_service_dependency() -> CacheService:
+    return get_cache_service()
+
+async def status_service_dependency() -> StatusService:
+    return get_status_service()
+
+# lyrics_alignment_service = LyricsAlignmentService(min_confidence=0.75)  # TODO: Implement this service
+# When it lands, run align_and_correct in a ProcessPoolExecutor: fuzzy matching is
+# pure-Python CPU work that would otherwise hold the GIL and stall the event loop.
+
+# Model-backed services. Importing them (torch, Demucs, faster-whisper) takes
+# seconds and Demucs loads its weights on construction, so each is imported and
+# built once in a worker thread, keeping the event loop free meanwhile.
+def _build_audio_separation_service() -> "AudioSeparationService":
+    from services.audio_separation_service import AudioSeparationService
+    return AudioSeparationService()
+
+def _build_whisper_service() -> "WhisperService":
+    from services.whisper_service import WhisperService
+    return WhisperService()
+
+_model_services: Dict[Callable, asyncio.Future] = {}
+
+def _load_model_service(build: Callable) -> asyncio.Future:
+    """Start building a model-backed service if it isn't already"""
+    future = _model_services.get(build)
+    if future is None:
+        future = asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, build)
+        _model_services[build] = future
+    return future
+
+async def _get_model_service(build: Callable):
+    future = _load_model_service(build)
+    try:
+        return await future
+    except Exception:
+        # Let the next request retry instead of caching the failure
+        if _model_services.get(build) is future:
+            del _model_services[build]
+        raise
+
+async def get_audio_separation_service() -> "AudioSeparationService":
+    return await _get_model_service(_build_audio_separation_service)
+
+async def get_whisper_service() -> "WhisperService":
+    return await _get_model_service(_build_whisper_service)
+
+# Models load at startup by default. Set WARM_UP_MODELS=0 on workers that only
+# serve /search; they then load on the first song, overlapping its download.
+WARM_UP_MODELS = os.getenv("WARM_UP_MODELS", "1") != "0"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the lightweight services once before serving: lru_cache doesn't lock,
+    # so concurrent first requests could otherwise each build their own
+    # (two in-memory StatusServices would split statuses and locks)
+    for get_service in (get_youtube_service, get_genius_service, get_cache_service, get_status_service):
+        get_service()
+    if WARM_UP_MODELS:
+        # Start loading Demucs in the background: startup isn't blocked,
+        # and the first song doesn't wait for the weights
+        _load_model_service(_build_audio_separation_service)
+        # Same for Whisper: constructing the service starts its model load in a thread
+        _load_model_service(_build_whisper_service)
+    yield
+
+# ORJSONResponse: large karaoke payloads are serialized in C, not by stdlib json
+app = FastAPI(title="Karaoke Platform API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware for frontend
 app.add_middleware(
@@ -29,17 +126,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-youtube_service = YouTubeService()
-whisper_service = WhisperService()
-genius_service = GeniusService()
-cache_service = CacheService()
-audio_separation_service = AudioSeparationService()
-# lyrics_alignment_service = LyricsAlignmentService(min_confidence=0.75)  # TODO: Implement this service
-
-# Track processing status for each video_id
+# Processing status for each video_id lives in StatusService (Redis)
 # Status can be: "processing", "completed", "failed"
-processing_status = {}
+
+# Songs being processed by this worker, so duplicate requests share one task.
+# This also holds the strong reference that keeps background tasks from being
+# garbage-collected mid-flight.
+_in_flight: Dict[str, asyncio.Task] = {}
+_in_flight_lock = asyncio.Lock()
+
+# Songs known to be ready, so status polls for finished songs skip Redis and disk
+_completed: Set[str] = set()
+
+# Per-song events that /status/stream waits on; set when processing finishes.
+# Streams also re-check periodically to pick up songs finished by other workers.
+_status_events: Dict[str, asyncio.Event] = {}
+# Open streams per song, so the last one to leave drops the song's event
+_status_stream_counts: Dict[str, int] = {}
+STATUS_STREAM_RECHECK = 15
+
+# Bound how many songs run the GPU-heavy stages at once. One full Demucs batch
+# is the most useful concurrency; anything beyond that only adds VRAM pressure.
+# Keep in step with AudioSeparationService.MAX_BATCH (not imported here, so
+# loading this module doesn't pull in torch).
+GPU_CONCURRENCY = 4
+_gpu_semaphore = asyncio.Semaphore(GPU_CONCURRENCY)
+
+# Separated audio never changes once written, so browsers may cache it for good
+AUDIO_CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+# How long cache-aside lookups stay in Redis
+SEARCH_CACHE_TTL = 10 * 60
+GENIUS_CACHE_TTL = 30 * 24 * 60 * 60
 
 class SearchRequest(BaseModel):
     query: str
@@ -63,16 +181,27 @@ async def root():
     return {"message": "Karaoke Platform API"}
 
 @app.post("/search", response_model=List[SearchResult])
-async def search_songs(request: SearchRequest):
+async def search_songs(
+    request: SearchRequest,
+    youtube_service: YouTubeService = Depends(youtube_service_dependency),
+    status_service: StatusService = Depends(status_service_dependency)
+):
     """Search for songs on YouTube"""
     try:
-        results = await youtube_service.search_songs(request.query)
+        cache_key = f"search:{hashlib.blake2b(request.query.encode(), digest_size=16).hexdigest()}"
+        results = await status_service.get_cached(cache_key)
+        if results is None:
+            results = await youtube_service.search_songs(request.query)
+            await status_service.set_cached(cache_key, results, SEARCH_CACHE_TTL)
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 @app.get("/check/{video_id}")
-async def check_video(video_id: str):
+async def check_video(
+    video_id: str,
+    youtube_service: YouTubeService = Depends(youtube_service_dependency)
+):
     """Pre-check if a video is available for processing"""
     try:
         availability = await youtube_service.check_video_availability(video_id)
@@ -85,69 +214,97 @@ async def check_video(video_id: str):
         }
 
 @app.post("/process/{video_id}")
-async def process_song(video_id: str):
+async def process_song(
+    video_id: str,
+    cache_service: CacheService = Depends(cache_service_dependency),
+    status_service: StatusService = Depends(status_service_dependency)
+):
     """Process a song for karaoke (download, transcribe, cache)"""
     try:
-        print(f"Processing request for video_id: {video_id}")
+        logger.info("Processing request for video_id: %s", video_id)
         
-        # Check cache first
-        cached_data = cache_service.get_cached_song(video_id)
-        if cached_data:
-            print(f"Found cached data for video_id: {video_id}")
-            return {"status": "ready", "data": cached_data}
-        
-        # Check if already processing to avoid duplicate tasks
-        if video_id in processing_status and processing_status[video_id]["status"] == "processing":
-            print(f"Already processing video_id: {video_id}, skipping duplicate request")
-            return {"status": "processing", "video_id": video_id}
-        
-        print(f"Starting background processing for video_id: {video_id}")
-        
-        # Mark as processing
-        processing_status[video_id] = {"status": "processing"}
-        
-        # Start processing
-        processing_task = asyncio.create_task(
-            _process_song_async(video_id)
-        )
+        # Serialize the check-then-start sequence so near-simultaneous
+        # requests can't both decide to start processing
+        async with _in_flight_lock:
+            # Check cache first
+            cached_data = cache_service.get_cached_song(video_id)
+            if cached_data:
+                logger.info("Found cached data for video_id: %s", video_id)
+                return {"status": "ready", "data": cached_data}
+            
+            # Not (or no longer) cached - e.g. a corrupt entry was discarded - so
+            # /status must stop answering "ready" from the fast path
+            _completed.discard(video_id)
+            
+            # Already running in this worker - share the existing task
+            if video_id in _in_flight:
+                logger.info("Already processing video_id: %s, skipping duplicate request", video_id)
+                return {"status": "processing", "video_id": video_id}
+            
+            # Claim the song to avoid duplicate tasks in other workers
+            if not await status_service.acquire_lock(video_id):
+                logger.info("Already processing video_id: %s, skipping duplicate request", video_id)
+                return {"status": "processing", "video_id": video_id}
+            
+            logger.info("Starting background processing for video_id: %s", video_id)
+            
+            # Mark as processing
+            await status_service.set_status(video_id, {"status": "processing"})
+            
+            # Start processing
+            _in_flight[video_id] = asyncio.create_task(
+                _process_song_async(video_id)
+            )
+            _in_flight[video_id].add_done_callback(
+                lambda _: _in_flight.pop(video_id, None)
+            )
         
         return {"status": "processing", "video_id": video_id}
     
     except Exception as e:
-        print(f"Processing error: {str(e)}")
+        logger.error("Processing error: %s", e)
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
 @app.get("/karaoke/{video_id}")
-async def get_karaoke_data(video_id: str):
+async def get_karaoke_data(
+    video_id: str,
+    cache_service: CacheService = Depends(cache_service_dependency)
+):
     """Get karaoke data for a processed song"""
     try:
-        print(f"Getting karaoke data for video_id: {video_id}")
+        logger.info("Getting karaoke data for video_id: %s", video_id)
         cached_data = cache_service.get_cached_song(video_id)
         if not cached_data:
-            print(f"No cached data found for video_id: {video_id}")
+            logger.info("No cached data found for video_id: %s", video_id)
             raise HTTPException(status_code=404, detail="Song not processed yet")
         
-        print(f"Found cached data for video_id: {video_id}")
+        logger.info("Found cached data for video_id: %s", video_id)
         return cached_data
     
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting karaoke data: {str(e)}")
+        logger.error("Error getting karaoke data: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get karaoke data: {str(e)}")
 
 @app.get("/status/{video_id}")
-async def get_processing_status(video_id: str):
+async def get_processing_status(
+    video_id: str,
+    status_service: StatusService = Depends(status_service_dependency),
+    cache_service: CacheService = Depends(cache_service_dependency)
+):
     """Check processing status of a song"""
     try:
-        # Check if completed (cached)
-        cached_data = cache_service.get_cached_song(video_id)
-        if cached_data:
+        # Hot path: client still polling a song that's already done
+        if video_id in _completed:
             return {"status": "ready"}
         
-        # Check if failed or processing
-        if video_id in processing_status:
-            status_info = processing_status[video_id]
+        # Check if completed, failed or processing
+        status_info = await status_service.get_status(video_id)
+        if status_info:
+            if status_info["status"] == "completed":
+                _completed.add(video_id)
+                return {"status": "ready"}
             if status_info["status"] == "failed":
                 return {
                     "status": "failed",
@@ -155,47 +312,127 @@ async def get_processing_status(video_id: str):
                 }
             return {"status": "processing"}
         
+        # Fall back to the cache (status entries expire)
+        cached_data = cache_service.get_cached_song(video_id)
+        if cached_data:
+            _completed.add(video_id)
+            return {"status": "ready"}
+        
         return {"status": "not_started"}
     
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
+@app.get("/status/stream/{video_id}")
+async def stream_processing_status(
+    video_id: str,
+    status_service: StatusService = Depends(status_service_dependency),
+    cache_service: CacheService = Depends(cache_service_dependency)
+):
+    """Push the processing status once it leaves "processing" (Server-Sent Events)"""
+    
+    async def _events():
+        _status_stream_counts[video_id] = _status_stream_counts.get(video_id, 0) + 1
+        try:
+            while True:
+                # Register before checking, so a completion in between still wakes us
+                event = _status_events.setdefault(video_id, asyncio.Event())
+                status = await get_processing_status(video_id, status_service, cache_service)
+                if status["status"] != "processing":
+                    yield f"data: {json.dumps(status)}\n\n"
+                    return
+                
+                try:
+                    await asyncio.wait_for(event.wait(), STATUS_STREAM_RECHECK)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from dropping the idle connection
+                    yield ": keep-alive\n\n"
+        finally:
+            # Songs that are done, not started or running on another worker are
+            # never popped by _process_song_async here - the last stream cleans up
+            remaining = _status_stream_counts.pop(video_id) - 1
+            if remaining:
+                _status_stream_counts[video_id] = remaining
+            else:
+                _status_events.pop(video_id, None)
+    
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+async def _get_lyrics_cached(title: str, artist: str) -> Optional[str]:
+    """Get Genius lyrics, going through the Redis cache first"""
+    status_service = get_status_service()
+    digest = hashlib.blake2b(f"{title}\n{artist}".encode(), digest_size=16).hexdigest()
+    cache_key = f"genius:{digest}"
+    lyrics = await status_service.get_cached(cache_key)
+    if lyrics is None:
+        lyrics = await get_genius_service().get_lyrics(title, artist)
+        # Don't cache misses - they may be transient API errors
+        if lyrics:
+            await status_service.set_cached(cache_key, lyrics, GENIUS_CACHE_TTL)
+    return lyrics
+
+_BANNER = "=" * 60
+
+def _log_stage(*lines: str, level: int = logging.INFO):
+    """Log a pipeline stage banner (not even built when the level is disabled)"""
+    if logger.isEnabledFor(level):
+        logger.log(level, "\n%s\n%s\n%s", _BANNER, "\n".join(lines), _BANNER)
+
 async def _process_song_async(video_id: str):
     """Background task to process a song"""
+    youtube_service = get_youtube_service()
+    cache_service = get_cache_service()
+    status_service = get_status_service()
+    original_path = None
+    genius_task = None
+    # No-op when warmed up; otherwise the model loads overlap the download
+    _load_model_service(_build_audio_separation_service)
+    _load_model_service(_build_whisper_service)
     try:
-        # 1. Download original song from YouTube
-        print(f"\n{'='*60}")
-        print(f"🎵 [1/5] Downloading song from YouTube...")
-        print(f"{'='*60}")
+        # 1. Download original song from YouTube. The lyrics lookup only needs
+        # title/artist, so resolve those first and fetch lyrics during the download
+        _log_stage("🎵 [1/5] Downloading song from YouTube (fetching lyrics from Genius meanwhile)...")
+        metadata = await youtube_service.get_metadata(video_id)
+        genius_task = asyncio.create_task(
+            _get_lyrics_cached(metadata['title'], metadata['artist'])
+        )
         original_path, metadata = await youtube_service.download_song(video_id)
-        print(f"✅ Download complete!")
-        
-        # 2. Separate audio into vocals and instrumental
-        print(f"\n{'='*60}")
-        print(f"🎚️  [2/5] Separating vocals and instrumental...")
-        print(f"    Using mdx_extra (fast model)")
-        print(f"{'='*60}")
-        vocals_path, instrumental_path = await audio_separation_service.separate_audio(original_path, video_id)
-        print(f"✅ Separation complete!")
-        
-        # 3. Transcribe original audio with Whisper (faster & more accurate!)
-        print(f"\n{'='*60}")
-        print(f"🎤 [3/5] Transcribing audio with faster-whisper...")
-        print(f"    Using base model with int8 quantization")
-        print(f"{'='*60}")
-        transcription = await whisper_service.transcribe_with_timestamps(original_path)
-        
-        # 4. Get lyrics from Genius for alignment
-        print(f"\n{'='*60}")
-        print(f"🎼 [4/5] Fetching lyrics from Genius...")
-        print(f"{'='*60}")
-        genius_lyrics = await genius_service.get_lyrics(metadata['title'], metadata['artist'])
-        print(f"✅ Lyrics fetched!")
+        logger.info("✅ Download complete!")
+        
+        # 2-4. Separation and transcription are independent, so run them
+        # concurrently (Whisper uses the original, unseparated audio)
+        _log_stage(
+            "⚡ [2-4/5] Running in parallel:",
+            "    🎚️  Separating vocals and instrumental (mdx_extra_q)",
+            "    🎤 Transcribing audio with faster-whisper",
+            "    🎼 Finishing lyrics lookup from Genius"
+        )
+        audio_separation_service = await get_audio_separation_service()
+        whisper_service = await get_whisper_service()
+        async with _gpu_semaphore:
+            separation_task = asyncio.create_task(
+                audio_separation_service.separate_audio(original_path, video_id)
+            )
+            whisper_task = asyncio.create_task(
+                whisper_service.transcribe_with_timestamps(original_path)
+            )
+            try:
+                (vocals_path, instrumental_path), transcription, genius_lyrics = await asyncio.gather(
+                    separation_task, whisper_task, genius_task
+                )
+            except Exception:
+                # Don't leave the other stages running if one of them failed
+                for task in (separation_task, whisper_task, genius_task):
+                    task.cancel()
+                raise
+        logger.info("✅ Separation, transcription and lyrics complete!")
         
         # 5. Prepare karaoke data (using Whisper transcription directly for now)
-        print(f"\n{'='*60}")
-        print(f"🎯 [5/5] Preparing karaoke data...")
-        print(f"{'='*60}")
+        _log_stage("🎯 [5/5] Preparing karaoke data...")
         
         # Use transcription directly without alignment service
         karaoke_data = {
@@ -205,51 +442,103 @@ async def _process_song_async(video_id: str):
             "title": metadata['title'],
             "artist": metadata['artist'],
             "genius_lyrics": genius_lyrics,
-            "whisper_original": transcription
+            "whisper_original": transcription,
+            "audio_etag": cache_service.compute_etag(instrumental_path)
         }
-        print(f"✅ Karaoke data prepared!")
+        logger.info("✅ Karaoke data prepared!")
         
         cache_service.cache_song(video_id, karaoke_data)
         
         # Mark as completed
-        processing_status[video_id] = {"status": "completed"}
+        await status_service.set_status(video_id, {"status": "completed"})
+        _completed.add(video_id)
         
-        print(f"\n{'='*60}")
-        print(f"🎉 Processing complete for {video_id}!")
-        print(f"✅ Song is ready to play!")
-        print(f"{'='*60}\n")
+        _log_stage(f"🎉 Processing complete for {video_id}!", "✅ Song is ready to play!")
         return karaoke_data
         
     except Exception as e:
         error_message = str(e)
-        print(f"\n{'='*60}")
-        print(f"❌ Error processing song {video_id}")
-        print(f"   {error_message}")
-        print(f"{'='*60}\n")
+        _log_stage(f"❌ Error processing song {video_id}", f"   {error_message}", level=logging.ERROR)
         
         # Mark as failed with error message
-        processing_status[video_id] = {
+        await status_service.set_status(video_id, {
             "status": "failed",
             "error": error_message
-        }
+        })
         
         # Don't re-raise to prevent "Task exception was never retrieved"
         return None
+    
+    finally:
+        # No-op if the lookup finished; stops it if the download failed
+        if genius_task:
+            genius_task.cancel()
+        
+        # The original download is only input for separation/transcription
+        if original_path:
+            youtube_service.remove_download(original_path)
+        await status_service.release_lock(video_id)
+        
+        # Wake up any /status/stream listeners
+        event = _status_events.pop(video_id, None)
+        if event:
+            event.set()
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Whether an If-None-Match header (comma-separated, possibly weak) lists etag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+@app.get("/cache/audio/{filename}")
+async def get_cached_audio(
+    filename: str,
+    request: Request,
+    cache_service: CacheService = Depends(cache_service_dependency)
+):
+    """Serve cached audio files (FileResponse streams via sendfile where available)"""
+    if os.path.basename(filename) != filename or not filename.endswith('.mp3'):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    
+    # The instrumental's ETag was computed when the song was processed - answer
+    # conditional GETs without a stat, but only when it's already in memory
+    # (a SQLite read would cost more than the stat it saves)
+    etag = None
+    video_id = filename.rsplit('_', 1)[0]
+    if filename == f"{video_id}_instrumental.mp3":
+        cached_data = cache_service.peek_cached_song(video_id)
+        etag = cached_data.get("audio_etag") if cached_data else None
+    if etag and _etag_matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers={"ETag": etag, **AUDIO_CACHE_HEADERS})
+    
+    audio_path = os.path.join(cache_service.audio_dir, filename)
+    if not os.path.isfile(audio_path):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    
+    headers = dict(AUDIO_CACHE_HEADERS)
+    if etag:
+        headers["ETag"] = etag
+    return FileResponse(audio_path, media_type="audio/mpeg", headers=headers)
 
-# Serve cached audio files
-app.mount("/cache", StaticFiles(directory="../cache"), name="cache")
+class StatusEndpointFilter(logging.Filter):
+    def filter(self, record):
+        # Hide GET /status/* requests from logs
+        return "/status/" not in record.getMessage()
 
 if __name__ == "__main__":
+    import copy
     import uvicorn
-    import logging
-    
-    # Configure logging to hide repetitive status checks
-    class StatusEndpointFilter(logging.Filter):
-        def filter(self, record):
-            # Hide GET /status/* requests from logs
-            return "/status/" not in record.getMessage()
+    from uvicorn.config import LOGGING_CONFIG
     
-    # Apply filter to uvicorn access logs
-    logging.getLogger("uvicorn.access").addFilter(StatusEndpointFilter())
+    # Extend uvicorn's logging config: hide repetitive status checks from the
+    # access log, and send app loggers through the same stderr handler
+    log_config = copy.deepcopy(LOGGING_CONFIG)
+    log_config["filters"] = {"hide_status": {"()": StatusEndpointFilter}}
+    log_config["loggers"]["uvicorn.access"]["filters"] = ["hide_status"]
+    log_config["root"] = {"handlers": ["default"], "level": "INFO"}
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_config=log_config)
@@ -1,28 +1,107 @@
 import os
+import logging
+import sys
+import ctypes
 import asyncio
-from typing import Tuple
-import subprocess
-import shutil
+import bisect
+from typing import List, Optional, Tuple
+
+import torch
+import torch.nn.functional as F
+import torchaudio
+from demucs.pretrained import get_model
+from demucs.apply import apply_model
+from demucs.audio import AudioFile, convert_audio, save_audio
+
+from services.executors import CPU_EXECUTOR
+
+logger = logging.getLogger(__name__)
 
 class AudioSeparationService:
     """
     Service for separating audio into vocals and instrumental using Demucs.
     Demucs is a state-of-the-art audio source separation library from Meta/Facebook Research.
+    
+    The model is loaded once and kept resident in memory, so each song only pays
+    for inference instead of interpreter startup + torch import + weight loading.
     """
     
+    # mdx_extra with DiffQ-quantized weights: ~4x smaller checkpoint, same architecture
+    MODEL_NAME = 'mdx_extra_q'
+    
+    # Inference settings (same meaning as the demucs CLI flags)
+    # - shifts=0: no random-shift test-time augmentation (default 1 doubles runtime)
+    # - overlap=0.1: minimal overlap between chunks (default 0.25)
+    # - segment=7.8: chunk length in seconds, keeps GPU memory bounded
+    SHIFTS = 0
+    OVERLAP = 0.1
+    SEGMENT = 7.8
+    
+    # Batching: concurrent requests arriving within BATCH_WINDOW seconds are
+    # stacked into one forward pass. Songs are only batched with others in the
+    # same length bucket (<4min, 4-8min, >8min) to limit wasted padding compute.
+    MAX_BATCH = 4
+    BATCH_WINDOW = 0.2
+    LENGTH_BUCKETS = (4 * 60, 8 * 60)
+    
     def __init__(self):
         # Use absolute paths
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
         self.cache_dir = os.path.join(project_root, 'cache')
         self.audio_dir = os.path.join(self.cache_dir, 'audio')
-        self.temp_dir = os.path.join(self.cache_dir, 'temp_separation')
         os.makedirs(self.audio_dir, exist_ok=True)
-        os.makedirs(self.temp_dir, exist_ok=True)
+        
+        # Batching state (created lazily on the running event loop)
+        self._queue = None
+        self._batch_task = None
+        self._deferred = []
+        
+        # Load Demucs once per process
+        # Model comparison:
+        # - htdemucs: High-quality but VERY SLOW (transformer-based)
+        # - htdemucs_ft: Slightly faster, but still slow
+        # - mdx_extra: 3-4x FASTER, good quality (recommended for speed)
+        # - mdx_extra_q: Even faster with quantization
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        logger.info("🔄 Loading Demucs '%s' model on %s...", self.MODEL_NAME, self.device)
+        self.model = get_model(self.MODEL_NAME)
+        self.model.to(self.device)
+        self.model.eval()
+        # Weights are loaded eagerly here (not on the first request); keep them
+        # dense, and optionally mlock them so a cold page cache can't stall a song
+        for param in self.model.parameters():
+            param.data = param.data.contiguous()
+        if self.device == 'cpu' and os.getenv("MLOCK_DEMUCS_WEIGHTS"):
+            self._mlock_weights()
+        # Half precision is only worth it (and only supported by autocast) on CUDA
+        self.use_half = self.device == 'cuda'
+        logger.info("✅ Demucs '%s' model loaded successfully", self.MODEL_NAME)
+        if self.use_half:
+            logger.info("   Using: CUDA with float16 autocast")
+    
+    def _mlock_weights(self):
+        """Pin CPU-resident weights in RAM so they are never paged back out to disk"""
+        if not sys.platform.startswith('linux'):
+            return
+        
+        try:
+            libc = ctypes.CDLL('libc.so.6', use_errno=True)
+            for param in self.model.parameters():
+                data = param.data
+                if libc.mlock(ctypes.c_void_p(data.data_ptr()), ctypes.c_size_t(data.nelement() * data.element_size())) != 0:
+                    raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+            logger.info("   Locked Demucs weights in memory")
+        except Exception as e:
+            # Usually RLIMIT_MEMLOCK is too low; weights still work, just pageable
+            logger.warning("Failed to mlock Demucs weights: %s", e)
     
     async def separate_audio(self, audio_path: str, video_id: str) -> Tuple[str, str]:
         """
         Separate audio into vocals and instrumental tracks.
         
+        Concurrent calls are coalesced by a background batcher so several songs
+        share a single Demucs forward pass.
+        
         Args:
             audio_path: Path to the original audio file
             video_id: Video ID for naming output files
@@ -30,98 +109,188 @@ class AudioSeparationService:
         Returns:
             Tuple of (vocals_path, instrumental_path)
         """
+        loop = asyncio.get_running_loop()
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
-        def _separate():
-            if not os.path.exists(audio_path):
-                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        # Stems survive a run that failed later (transcription, lyrics), so a retry
+        # doesn't need to redo the separation
+        existing = self._existing_stems(video_id)
+        if existing:
+            logger.info("Reusing existing stems for %s", video_id)
+            return existing
+        
+        try:
+            logger.info("Starting audio separation for %s (using fast %s model)...", video_id, self.MODEL_NAME)
+            
+            wav, ref_mean, ref_std = await loop.run_in_executor(CPU_EXECUTOR, self._load_audio, audio_path)
+            
+            # Hand the waveform to the batcher and wait for our slice of the batch
+            self._ensure_batcher()
+            future = loop.create_future()
+            await self._queue.put((wav, future))
+            sources = await future
+            
+            sources = sources * ref_std + ref_mean
+            return await loop.run_in_executor(CPU_EXECUTOR, self._save_stems, sources, video_id)
             
+        except Exception as e:
+            error_msg = f"Audio separation error: {str(e)}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+    
+    def _load_audio(self, audio_path: str) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Decode audio and normalize it the same way the demucs CLI does"""
+        if audio_path.endswith('.wav'):
+            # PCM input: read samples directly, no ffmpeg roundtrip
+            wav, samplerate = torchaudio.load(audio_path)
+            wav = convert_audio(wav, samplerate, self.model.samplerate, self.model.audio_channels)
+        else:
+            # Decode straight to the model's sample rate / channel layout
+            wav = AudioFile(audio_path).read(
+                streams=0,
+                samplerate=self.model.samplerate,
+                channels=self.model.audio_channels
+            )
+        
+        ref = wav.mean(0)
+        ref_mean, ref_std = ref.mean(), ref.std()
+        return (wav - ref_mean) / ref_std, ref_mean, ref_std
+    
+    def _save_stems(self, sources: torch.Tensor, video_id: str) -> Tuple[str, str]:
+        """Encode the vocals and no-vocals stems as mp3"""
+        # Two stems only: vocals and everything else summed (--two-stems vocals)
+        vocals_index = self.model.sources.index('vocals')
+        vocals = sources[vocals_index]
+        instrumental = sources.sum(0) - vocals
+        
+        vocals_dest, instrumental_dest = self._stem_paths(video_id)
+        
+        self._save_stem_atomic(vocals, vocals_dest)
+        self._save_stem_atomic(instrumental, instrumental_dest)
+        
+        logger.info("Separation complete for %s", video_id)
+        logger.info("Vocals: %s", vocals_dest)
+        logger.info("Instrumental: %s", instrumental_dest)
+        
+        return vocals_dest, instrumental_dest
+    
+    def _save_stem_atomic(self, stem: torch.Tensor, dest: str):
+        """
+        Encode a stem next to its destination and rename it into place, so the
+        audio endpoint and the stem reuse check never see a half-written mp3.
+        """
+        root, ext = os.path.splitext(dest)
+        tmp_path = f'{root}.partial{ext}'  # save_audio picks the encoder from the suffix
+        try:
+            save_audio(stem, tmp_path, samplerate=self.model.samplerate, bitrate=192)
+            os.replace(tmp_path, dest)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _stem_paths(self, video_id: str) -> Tuple[str, str]:
+        """Output paths for the (vocals, instrumental) stems of a song"""
+        return (
+            os.path.join(self.audio_dir, f'{video_id}_vocals.mp3'),
+            os.path.join(self.audio_dir, f'{video_id}_instrumental.mp3')
+        )
+    
+    def _existing_stems(self, video_id: str) -> Optional[Tuple[str, str]]:
+        """Stem paths if both stems were already written, else None"""
+        paths = self._stem_paths(video_id)
+        for path in paths:
             try:
-                # Run demucs separation
-                # Using mdx_extra model (OPTIMIZED FOR SPEED)
-                # Model comparison:
-                # - htdemucs: High-quality but VERY SLOW (transformer-based)
-                # - htdemucs_ft: Slightly faster, but still slow
-                # - mdx_extra: 3-4x FASTER, good quality (recommended for speed)
-                # - mdx_extra_q: Even faster with quantization
-                
-                print(f"Starting audio separation for {video_id} (using fast mdx_extra model)...")
-                
-                # Demucs command optimized for speed
-                # -n: model name (mdx_extra for speed)
-                # -o: output directory
-                # --two-stems: only separate into vocals and accompaniment (faster)
-                # --mp3: output format
-                # --mp3-bitrate: bitrate for mp3
-                # --int24: use int24 instead of float32 (faster processing)
-                cmd = [
-                    'python', '-m', 'demucs',
-                    '--two-stems', 'vocals',  # Only separate vocals from the rest
-                    '-o', self.temp_dir,
-                    '--mp3',
-                    '--mp3-bitrate', '192',
-                    '-n', 'mdx_extra',  # FAST model (3-4x faster than htdemucs)
-                    '--int24',  # Use int24 for faster processing
-                    audio_path
-                ]
-                
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                
-                print(f"Demucs output: {result.stdout}")
-                
-                # Demucs creates: temp_separation/mdx_extra/<filename>/vocals.mp3 and no_vocals.mp3
-                audio_filename = os.path.splitext(os.path.basename(audio_path))[0]
-                separation_dir = os.path.join(self.temp_dir, 'mdx_extra', audio_filename)
-                
-                vocals_src = os.path.join(separation_dir, 'vocals.mp3')
-                instrumental_src = os.path.join(separation_dir, 'no_vocals.mp3')
-                
-                # Check if files were created
-                if not os.path.exists(vocals_src):
-                    raise FileNotFoundError(f"Vocals file not created: {vocals_src}")
-                if not os.path.exists(instrumental_src):
-                    raise FileNotFoundError(f"Instrumental file not created: {instrumental_src}")
-                
-                # Move to final locations with proper naming
-                vocals_dest = os.path.join(self.audio_dir, f'{video_id}_vocals.mp3')
-                instrumental_dest = os.path.join(self.audio_dir, f'{video_id}_instrumental.mp3')
-                
-                shutil.move(vocals_src, vocals_dest)
-                shutil.move(instrumental_src, instrumental_dest)
-                
-                # Clean up temporary separation directory
+                if os.stat(path).st_size == 0:
+                    return None
+            except FileNotFoundError:
+                return None
+        return paths
+    
+    def _ensure_batcher(self):
+        """Start the batching consumer on the running event loop if needed"""
+        if self._batch_task is None or self._batch_task.done():
+            self._queue = asyncio.Queue()
+            self._deferred = []
+            self._batch_task = asyncio.create_task(self._batch_worker())
+    
+    def _length_bucket(self, wav: torch.Tensor) -> int:
+        """Bucket index for a waveform, so only similar-length songs share a batch"""
+        seconds = wav.shape[-1] / self.model.samplerate
+        return bisect.bisect(self.LENGTH_BUCKETS, seconds)
+    
+    async def _batch_worker(self):
+        """Drain queued separations into batches of up to MAX_BATCH songs"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            first = self._deferred.pop(0) if self._deferred else await self._queue.get()
+            bucket = self._length_bucket(first[0])
+            batch = [first]
+            
+            # Songs deferred from an earlier window go first
+            for item in list(self._deferred):
+                if len(batch) >= self.MAX_BATCH:
+                    break
+                if self._length_bucket(item[0]) == bucket:
+                    self._deferred.remove(item)
+                    batch.append(item)
+            
+            # Wait a short window for more songs to arrive
+            deadline = loop.time() + self.BATCH_WINDOW
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
                 try:
-                    shutil.rmtree(os.path.join(self.temp_dir, 'mdx_extra'))
-                except Exception as e:
-                    print(f"Warning: Failed to clean up temp directory: {e}")
-                
-                print(f"Separation complete for {video_id}")
-                print(f"Vocals: {vocals_dest}")
-                print(f"Instrumental: {instrumental_dest}")
-                
-                return vocals_dest, instrumental_dest
-                
-            except subprocess.CalledProcessError as e:
-                error_msg = f"Demucs separation failed: {e.stderr}"
-                print(error_msg)
-                raise Exception(error_msg)
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if self._length_bucket(item[0]) == bucket:
+                    batch.append(item)
+                else:
+                    self._deferred.append(item)
+            
+            try:
+                results = await loop.run_in_executor(
+                    CPU_EXECUTOR, self._separate_batch, [wav for wav, _ in batch]
+                )
             except Exception as e:
-                error_msg = f"Audio separation error: {str(e)}"
-                print(error_msg)
-                raise Exception(error_msg)
-        
-        return await asyncio.get_event_loop().run_in_executor(None, _separate)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), sources in zip(batch, results):
+                    if not future.done():
+                        future.set_result(sources)
     
-    def cleanup_temp_files(self):
-        """Clean up temporary separation files"""
-        try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-                os.makedirs(self.temp_dir, exist_ok=True)
-        except Exception as e:
-            print(f"Warning: Failed to clean up temp files: {e}")
-
+    def _separate_batch(self, wavs: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Run one Demucs forward pass over a zero-padded [B, C, T] batch"""
+        lengths = [wav.shape[-1] for wav in wavs]
+        max_length = max(lengths)
+        batch = torch.stack([F.pad(wav, (0, max_length - wav.shape[-1])) for wav in wavs])
+        if self.device == 'cuda':
+            # Pinned host memory lets the host->GPU copy run asynchronously
+            batch = batch.pin_memory()
+        
+        if len(wavs) > 1:
+            logger.info("Separating batch of %s songs", len(wavs))
+        
+        with torch.inference_mode(), torch.autocast(
+            device_type=self.device, dtype=torch.float16, enabled=self.use_half
+        ):
+            sources = apply_model(
+                self.model,
+                batch.to(self.device, non_blocking=True),
+                device=self.device,
+                shifts=self.SHIFTS,
+                split=True,
+                overlap=self.OVERLAP,
+                segment=self.SEGMENT
+            )
+        sources = sources.float().cpu()
+        
+        # Trim each song's padding back off: [B, S, C, T] -> B x [S, C, T_i]
+        return [sources[i, ..., :length] for i, length in enumerate(lengths)]
@@ -1,81 +1,189 @@
 import json
+import logging
 import os
 from typing import Optional, Dict
 import hashlib
+import sqlite3
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 class CacheService:
+    # Parsed songs kept in memory (LRU) in front of the SQLite store
+    MAX_MEMORY_ENTRIES = 512
+    
     def __init__(self):
         self.cache_dir = "../cache"
         self.metadata_dir = os.path.join(self.cache_dir, "metadata")
+        self.audio_dir = os.path.join(self.cache_dir, "audio")
+        # Extracted YouTube info persisted by YouTubeService
+        self.info_dir = os.path.join(self.cache_dir, "info")
         os.makedirs(self.cache_dir, exist_ok=True)
         os.makedirs(self.metadata_dir, exist_ok=True)
+        
+        # All song metadata lives in one SQLite file (WAL mode) instead of one
+        # JSON file per song - a cache write is a single INSERT OR REPLACE
+        self.db_path = os.path.join(self.metadata_dir, "metadata.sqlite")
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS songs (video_id TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._import_json_files()
+    
+    @staticmethod
+    def _dumps(karaoke_data: Dict) -> bytes:
+        if orjson:
+            return orjson.dumps(karaoke_data, option=orjson.OPT_NON_STR_KEYS)
+        # Default ensure_ascii=True stays on the C ASCII encoder fast path
+        return json.dumps(karaoke_data).encode('ascii')
+    
+    @staticmethod
+    def _loads(raw: bytes) -> Dict:
+        return orjson.loads(raw) if orjson else json.loads(raw)
+    
+    def _import_json_files(self):
+        """One-time migration of legacy per-song JSON files into the SQLite store"""
+        with os.scandir(self.metadata_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    with open(entry.path, 'rb') as f:
+                        raw = f.read()
+                    try:
+                        self._loads(raw)
+                    except ValueError:
+                        # Torn write from the old file store - drop it so the song is reprocessed
+                        logger.warning("Discarding corrupt cache file %s", entry.path)
+                        os.unlink(entry.path)
+                        continue
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO songs (video_id, data) VALUES (?, ?)",
+                        (entry.name[:-len('.json')], raw)
+                    )
+                    os.unlink(entry.path)
+                except Exception as e:
+                    logger.error("Error importing cache file %s: %s", entry.path, e)
+    
+    def _remember(self, video_id: str, karaoke_data: Dict):
+        """Store parsed data in the in-memory LRU, evicting the oldest entry"""
+        self._memory[video_id] = karaoke_data
+        self._memory.move_to_end(video_id)
+        if len(self._memory) > self.MAX_MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
     
     def get_cached_song(self, video_id: str) -> Optional[Dict]:
         """Get cached karaoke data for a song"""
-        cache_file = os.path.join(self.metadata_dir, f"{video_id}.json")
+        karaoke_data = self._memory.get(video_id)
+        if karaoke_data is not None:
+            self._memory.move_to_end(video_id)
+            return karaoke_data
         
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error reading cache file {cache_file}: {str(e)}")
+        try:
+            row = self._db.execute("SELECT data FROM songs WHERE video_id = ?", (video_id,)).fetchone()
+            if row is None:
                 return None
+            karaoke_data = self._loads(row[0])
+        except ValueError as e:
+            # Unparseable entry: delete it instead of failing on every lookup
+            logger.error("Discarding corrupt cached song %s: %s", video_id, e)
+            self._db.execute("DELETE FROM songs WHERE video_id = ?", (video_id,))
+            return None
+        except Exception as e:
+            logger.error("Error reading cached song %s: %s", video_id, e)
+            return None
         
-        return None
+        self._remember(video_id, karaoke_data)
+        return karaoke_data
+    
+    def peek_cached_song(self, video_id: str) -> Optional[Dict]:
+        """Get cached karaoke data only if it's in the in-memory LRU (no SQLite read)"""
+        return self._memory.get(video_id)
     
     def cache_song(self, video_id: str, karaoke_data: Dict) -> bool:
         """Cache karaoke data for a song"""
-        cache_file = os.path.join(self.metadata_dir, f"{video_id}.json")
-        
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(karaoke_data, f, indent=2, ensure_ascii=False)
+            self._db.execute(
+                "INSERT OR REPLACE INTO songs (video_id, data) VALUES (?, ?)",
+                (video_id, self._dumps(karaoke_data))
+            )
+            self._remember(video_id, karaoke_data)
             return True
         except Exception as e:
-            print(f"Error caching song data: {str(e)}")
+            logger.error("Error caching song data: %s", e)
             return False
     
+    def compute_etag(self, file_path: str) -> str:
+        """Cheap ETag for an audio file: hash of its size plus first and last KB"""
+        size = os.path.getsize(file_path)
+        # blake2b is faster than sha1/sha256 and we don't need a cryptographic guarantee
+        digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(1024))
+            if size > 1024:
+                f.seek(-1024, os.SEEK_END)
+                digest.update(f.read(1024))
+        return f'"{digest.hexdigest()}"'
+    
     def is_song_cached(self, video_id: str) -> bool:
         """Check if a song is already cached"""
-        cache_file = os.path.join(self.metadata_dir, f"{video_id}.json")
-        return os.path.exists(cache_file)
+        if video_id in self._memory:
+            return True
+        row = self._db.execute("SELECT 1 FROM songs WHERE video_id = ?", (video_id,)).fetchone()
+        return row is not None
     
     def clear_cache(self) -> bool:
         """Clear all cached data"""
+        self._memory.clear()
         try:
-            # Clear metadata files
-            for file in os.listdir(self.metadata_dir):
-                if file.endswith('.json'):
-                    os.remove(os.path.join(self.metadata_dir, file))
+            # Clear metadata
+            self._db.execute("DELETE FROM songs")
             
             # Clear audio files
-            audio_dir = os.path.join(self.cache_dir, "audio")
-            if os.path.exists(audio_dir):
-                for file in os.listdir(audio_dir):
-                    if file.endswith('.mp3'):
-                        os.remove(os.path.join(audio_dir, file))
+            try:
+                with os.scandir(self.audio_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.mp3'):
+                            os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+            
+            # Clear persisted YouTube info
+            try:
+                with os.scandir(self.info_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.json'):
+                            os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
             
             return True
         except Exception as e:
-            print(f"Error clearing cache: {str(e)}")
+            logger.error("Error clearing cache: %s", e)
             return False
     
+    def _count_files(self, directory: str, suffix: str) -> int:
+        """Count files ending in suffix with a single scandir pass"""
+        count = 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(suffix):
+                        count += 1
+        except FileNotFoundError:
+            pass
+        return count
+    
     def get_cache_size(self) -> Dict[str, int]:
         """Get cache statistics"""
-        metadata_count = 0
-        audio_count = 0
-        
-        # Count metadata files
-        if os.path.exists(self.metadata_dir):
-            metadata_count = len([f for f in os.listdir(self.metadata_dir) if f.endswith('.json')])
-        
-        # Count audio files
-        audio_dir = os.path.join(self.cache_dir, "audio")
-        if os.path.exists(audio_dir):
-            audio_count = len([f for f in os.listdir(audio_dir) if f.endswith('.mp3')])
-        
         return {
-            "cached_songs": metadata_count,
-            "audio_files": audio_count
+            "cached_songs": self._db.execute("SELECT COUNT(*) FROM songs").fetchone()[0],
+            "audio_files": self._count_files(self.audio_dir, '.mp3')
         }
@@ -0,0 +1,15 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Bounded thread pools shared by all services, instead of asyncio's default
+# executor (min(32, cpus + 4) threads for everything).
+#
+# CPU_EXECUTOR runs model inference and audio decode/encode. Each of those jobs
+# already spreads over every core (torch and CTranslate2 intra-op threads), so this
+# is a small fixed number of job slots, not a thread per core: it caps how many
+# multithreaded jobs compete at once, which keeps oversubscription bounded.
+CPU_WORKERS = min(4, os.cpu_count() or 1)
+CPU_EXECUTOR = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu")
+
+# IO_EXECUTOR runs blocking network calls (yt-dlp, Genius) and one-off model loads
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="io")
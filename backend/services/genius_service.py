@@ -1,12 +1,22 @@
 import lyricsgenius
+import logging
 import asyncio
 from typing import Optional
 import os
 from dotenv import load_dotenv
+from rapidfuzz import fuzz
+
+from services.executors import IO_EXECUTOR
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
 class GeniusService:
+    # Genius hits whose title scores below this against the requested title are
+    # treated as misses, so wrong-song lyrics aren't returned (and cached)
+    MIN_TITLE_SIMILARITY = 80
+    
     def __init__(self):
         # Initialize Genius API (optional - will work without token but with rate limits)
         token = os.getenv("GENIUS_ACCESS_TOKEN")
@@ -16,7 +26,7 @@ class GeniusService:
             self.genius.remove_section_headers = True  # Clean up lyrics
         else:
             self.genius = None
-            print("Warning: No Genius API token found. Lyrics backup will be limited.")
+            logger.warning("No Genius API token found. Lyrics backup will be limited.")
     
     async def get_lyrics(self, title: str, artist: str) -> Optional[str]:
         """Get lyrics from Genius API as backup/verification"""
@@ -29,32 +39,39 @@ class GeniusService:
                 # Search for the song
                 song = self.genius.search_song(title, artist)
                 
-                if song:
+                if self._matches(song, title):
                     return song.lyrics
                 else:
                     # Try with just the title if artist search fails
                     song = self.genius.search_song(title)
-                    return song.lyrics if song else None
+                    return song.lyrics if self._matches(song, title) else None
                     
             except Exception as e:
-                print(f"Genius API error: {str(e)}")
+                logger.error("Genius API error: %s", e)
                 return None
         
-        return await asyncio.get_event_loop().run_in_executor(None, _search_lyrics)
+        return await asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, _search_lyrics)
+    
+    def _matches(self, song, title: str) -> bool:
+        """Whether a Genius hit is plausibly the requested song"""
+        if not song:
+            return False
+        # token_set_ratio ignores extra words like "(Official Video)" on either side
+        score = fuzz.token_set_ratio(title.lower(), song.title.lower())
+        if score < self.MIN_TITLE_SIMILARITY:
+            logger.info("Ignoring Genius hit '%s' for '%s' (similarity %.0f)", song.title, title, score)
+            return False
+        return True
     
     def clean_lyrics(self, lyrics: str) -> str:
         """Clean up lyrics text"""
         if not lyrics:
             return ""
         
-        # Remove common artifacts
-        lines = lyrics.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            # Skip empty lines and common artifacts
-            if line and not line.startswith('[') and not line.endswith('Lyrics'):
-                cleaned_lines.append(line)
-        
-        return '\n'.join(cleaned_lines)
+        # Remove common artifacts: empty lines, [Section] headers and "... Lyrics" titles.
+        # A single generator pass keeps the per-line work in C string methods.
+        stripped = (line.strip() for line in lyrics.split('\n'))
+        return '\n'.join(
+            line for line in stripped
+            if line and not line.startswith('[') and not line.endswith('Lyrics')
+        )
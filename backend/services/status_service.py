@@ -0,0 +1,118 @@
+import redis.asyncio as redis
+import logging
+import json
+import time
+from typing import Any, Optional, Dict, Tuple
+import os
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+class StatusService:
+    """
+    Tracks per-song processing status in Redis so every Uvicorn worker sees
+    the same state and it survives restarts. Also provides a cache-aside store
+    for slow external lookups (Genius lyrics, YouTube search results).
+
+    Run Redis with `maxmemory-policy allkeys-lru` so cached lookups are evicted
+    under a fixed memory budget.
+
+    Falls back to an in-process dict when REDIS_URL isn't set (single worker only).
+    """
+
+    # Status entries and processing locks expire after an hour
+    STATUS_TTL = 3600
+    
+    # Without Redis, cached lookups live in a bounded in-process LRU (the
+    # equivalent of allkeys-lru under maxmemory)
+    MAX_LOCAL_CACHE_ENTRIES = 1024
+
+    def __init__(self):
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        else:
+            self.redis = None
+            logger.warning("No REDIS_URL found. Processing status will only be tracked in this process.")
+
+        # In-memory fallback state
+        self._statuses: Dict[str, Dict] = {}
+        self._locks = set()
+        self._cached: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get_status(self, video_id: str) -> Optional[Dict]:
+        """Get the processing status for a song, if any"""
+        if not self.redis:
+            return self._statuses.get(video_id)
+
+        raw = await self.redis.get(f"status:{video_id}")
+        return json.loads(raw) if raw else None
+
+    async def set_status(self, video_id: str, status: Dict):
+        """Set the processing status for a song"""
+        if not self.redis:
+            self._statuses[video_id] = status
+            return
+
+        await self.redis.set(f"status:{video_id}", json.dumps(status), ex=self.STATUS_TTL)
+
+    async def acquire_lock(self, video_id: str) -> bool:
+        """
+        Claim a song for processing across all workers (SETNX).
+
+        Returns:
+            True if this caller owns the song, False if it's already being processed
+        """
+        if not self.redis:
+            if video_id in self._locks:
+                return False
+            self._locks.add(video_id)
+            return True
+
+        return bool(await self.redis.set(f"lock:{video_id}", "1", nx=True, ex=self.STATUS_TTL))
+
+    async def release_lock(self, video_id: str):
+        """Release a song claimed with acquire_lock"""
+        if not self.redis:
+            self._locks.discard(video_id)
+            return
+
+        await self.redis.delete(f"lock:{video_id}")
+
+    async def get_cached(self, key: str) -> Optional[Any]:
+        """Get a cached lookup result, or None on a miss"""
+        if not self.redis:
+            entry = self._cached.get(key)
+            if not entry:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._cached[key]
+                return None
+            self._cached.move_to_end(key)
+            return value
+
+        # The cache only saves time: on a Redis error, treat it as a miss
+        try:
+            raw = await self.redis.get(f"cache:{key}")
+        except redis.RedisError as e:
+            logger.warning("⚠️  Cache lookup failed for %s: %s", key, e)
+            return None
+        return json.loads(raw) if raw else None
+
+    async def set_cached(self, key: str, value: Any, ttl: int):
+        """Cache a lookup result for ttl seconds"""
+        if not self.redis:
+            self._cached[key] = (time.monotonic() + ttl, value)
+            self._cached.move_to_end(key)
+            if len(self._cached) > self.MAX_LOCAL_CACHE_ENTRIES:
+                self._cached.popitem(last=False)
+            return
+
+        try:
+            await self.redis.set(f"cache:{key}", json.dumps(value), ex=ttl)
+        except redis.RedisError as e:
+            logger.warning("⚠️  Cache store failed for %s: %s", key, e)
@@ -1,10 +1,63 @@
 import yt_dlp
+import logging
 import os
 import asyncio
 from typing import List, Dict, Tuple, Optional
 import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from services.executors import IO_EXECUTOR
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    import json
+    orjson = None
+
+try:
+    import re2 as title_re  # google-re2: compiled automaton, faster than the re VM
+except ImportError:  # Fall back to stdlib re
+    title_re = re
+
+logger = logging.getLogger(__name__)
 
 class YouTubeService:
+    # Common title patterns folded into one anchored alternation, compiled once.
+    # Alternatives are tried in order, so "-" still wins over ":" and "by"
+    # (RE2 uses the same leftmost-first preference). Inline (?i) works in both engines.
+    TITLE_RE = title_re.compile(
+        r'(?i)^(?:(?P<dash_artist>.+?)\s*-\s*(?P<dash_song>.+)'  # Artist - Song
+        r'|(?P<colon_artist>.+?)\s*:\s*(?P<colon_song>.+)'  # Artist: Song
+        r'|(?P<by_song>.+?)\s+by\s+(?P<by_artist>.+))$'  # Song by Artist (reversed)
+    )
+    
+    # Extracted video info is reused between /check and /process so YouTube is
+    # only hit once per song. Stream URLs in it expire after a few hours.
+    INFO_CACHE_SIZE = 128
+    INFO_CACHE_TTL = 600
+    
+    # Extensions yt-dlp can leave behind when the WAV postprocessor doesn't run
+    DOWNLOAD_EXTENSIONS = ('m4a', 'webm', 'opus', 'mp4', 'mp3', 'mhtml')
+    
+    # Results fetched per search (each one is an entry in yt-dlp's flat results page)
+    SEARCH_RESULTS = 10
+    
+    # Concurrent downloads (each one a yt-dlp + ffmpeg job). Capped so a burst of
+    # songs can't take every IO thread - searches and metadata lookups for other
+    # requests keep flowing while downloads queue up here.
+    MAX_CONCURRENT_DOWNLOADS = 4
+    
+    # tmpfs room one download needs: a 6-minute 44.1 kHz stereo PCM16 WAV is ~63 MB,
+    # plus the compressed stream it's decoded from. /dev/shm is only used when it
+    # can hold MAX_CONCURRENT_DOWNLOADS of these (Docker's default is just 64 MB).
+    SHM_BYTES_PER_DOWNLOAD = 128 * 1024 * 1024
+    
+    # Downloads older than this at startup were left behind by a crashed worker
+    STALE_DOWNLOAD_AGE = 3600
+    
     def __init__(self):
         # Use absolute paths to avoid cwd-related issues
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -12,25 +65,60 @@ class YouTubeService:
         self.audio_dir = os.path.join(self.cache_dir, 'audio')
         os.makedirs(self.audio_dir, exist_ok=True)
         
-        # yt-dlp options for fast downloads
+        # Downloads are only intermediate input for Whisper/Demucs, so keep
+        # them in RAM (tmpfs) when there's room instead of on disk
+        if self._shm_has_room():
+            self.download_dir = os.path.join('/dev/shm', 'karaoke')
+        else:
+            self.download_dir = os.path.join(self.cache_dir, 'downloads')
+        os.makedirs(self.download_dir, exist_ok=True)
+        self._remove_stale_downloads()
+        
+        # Extracted info is also persisted (for INFO_CACHE_TTL) so other workers
+        # and retries after a restart skip the YouTube round trip too
+        self.info_dir = os.path.join(self.cache_dir, 'info')
+        os.makedirs(self.info_dir, exist_ok=True)
+        self._last_info_sweep = 0.0
+        
+        # video_id -> (extracted_at, info), shared by the executor threads
+        self._info_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._info_lock = threading.Lock()
+        
+        self._download_slots = asyncio.Semaphore(self.MAX_CONCURRENT_DOWNLOADS)
+        
+        # Long-lived YoutubeDL instances, one per IO thread (they aren't thread-safe)
+        self._local = threading.local()
+        
+        # yt-dlp options for fast downloads. Searches stay on yt-dlp (flat, one request
+        # per query) rather than calling the private innertube API directly: its
+        # request/response format changes without notice and yt-dlp tracks it for us
         self.ydl_opts_search = {
             'quiet': True,
             'no_warnings': True,
             'extract_flat': True,
         }
         
-        # Base download options (we override outtmpl per file to fixed names)
+        # Download options. Fixed output name per video id to avoid unicode/rename issues
         self.ydl_opts_download = {
+            'outtmpl': os.path.join(self.download_dir, '%(id)s_original.%(ext)s'),
             # Explicitly avoid mhtml/dash formats, prefer direct audio streams
             'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio[ext=opus]/140/251/250/bestaudio/best',
             'format_sort': ['hasvid:false', 'br', 'res', 'fps'],  # Prefer audio-only
             'restrictfilenames': True,  # safe ascii filenames
             'overwrites': True,
+            # Decode once to PCM16 WAV - consumers read raw samples, no mp3 roundtrip.
+            # This is a decode only (no lossy re-encode): Demucs and Whisper would each
+            # have to decode the Opus/AAC stream otherwise, so doing it once here is cheaper.
             'postprocessors': [{
                 'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
+                'preferredcodec': 'wav',
             }],
+            # Decode straight to Demucs' 44.1 kHz stereo: YouTube audio is 48 kHz, and
+            # resampling inside ffmpeg's decode is cheaper than convert_audio in torch
+            # (and leaves ~8% less PCM to write and read back)
+            'postprocessor_args': {
+                'extractaudio': ['-ar', '44100', '-ac', '2'],
+            },
             'quiet': False,  # Show more info for debugging
             'no_warnings': False,
             'ignoreerrors': False,  # Fail fast on errors
@@ -50,31 +138,30 @@ class YouTubeService:
         """Check if a video is available for download without actually downloading it"""
         def _check():
             try:
-                with yt_dlp.YoutubeDL(self.ydl_opts_search) as ydl:
-                    info = ydl.extract_info(f"https://youtube.com/watch?v={video_id}", download=False)
-                    
-                    # Check for common issues
-                    issues = []
-                    
-                    if info.get('age_limit', 0) > 0:
-                        issues.append('age_restricted')
-                    
-                    if info.get('is_live'):
-                        issues.append('live_stream')
-                    
-                    if not info.get('formats'):
-                        issues.append('no_formats_available')
-                    
-                    availability = info.get('availability', 'unknown')
-                    if availability not in ['public', 'unlisted']:
-                        issues.append(f'not_available_{availability}')
-                    
-                    return {
-                        'available': len(issues) == 0,
-                        'issues': issues,
-                        'title': info.get('title', ''),
-                        'duration': info.get('duration', 0)
-                    }
+                info = self._extract_info(self._download_ydl(), video_id)
+                
+                # Check for common issues
+                issues = []
+                
+                if info.get('age_limit', 0) > 0:
+                    issues.append('age_restricted')
+                
+                if info.get('is_live'):
+                    issues.append('live_stream')
+                
+                if not info.get('formats'):
+                    issues.append('no_formats_available')
+                
+                availability = info.get('availability', 'unknown')
+                if availability not in ['public', 'unlisted']:
+                    issues.append(f'not_available_{availability}')
+                
+                return {
+                    'available': len(issues) == 0,
+                    'issues': issues,
+                    'title': info.get('title', ''),
+                    'duration': info.get('duration', 0)
+                }
             except Exception as e:
                 return {
                     'available': False,
@@ -82,149 +169,344 @@ class YouTubeService:
                     'error': str(e)
                 }
         
-        return await asyncio.get_event_loop().run_in_executor(None, _check)
+        return await asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, _check)
     
-    async def search_songs(self, query: str, max_results: int = 10) -> List[Dict]:
+    async def search_songs(self, query: str, max_results: Optional[int] = None) -> List[Dict]:
         """Search for songs on YouTube"""
+        max_results = max_results or self.SEARCH_RESULTS
+        
         def _search():
-            with yt_dlp.YoutubeDL(self.ydl_opts_search) as ydl:
-                search_results = ydl.extract_info(
-                    f"ytsearch{max_results}:{query}",
-                    download=False
-                )
-                
-                results = []
-                for entry in search_results.get('entries', []):
-                    # Parse title to extract artist and song
-                    title = entry.get('title', '')
-                    artist, song_title = self._parse_title(title)
-                    
-                    try:
-                        duration = self._format_duration(entry.get('duration'))
-                    except Exception:
-                        duration = "Unknown"
-                    
-                    results.append({
-                        'id': entry.get('id'),
-                        'title': song_title,
-                        'artist': artist,
-                        'duration': duration,
-                        'thumbnail': entry.get('thumbnail', ''),
-                        'full_title': title
-                    })
-                
-                return results
+            # The count stays in the search key: a bare "ytsearch:" means one result
+            search_results = self._search_ydl().extract_info(
+                f"ytsearch{max_results}:{query}",
+                download=False
+            )
+            
+            # Parsing is a few microseconds per entry - a worker pool would cost
+            # more than it saves, so build the results in a single pass
+            return [self._search_result(entry) for entry in search_results.get('entries') or []]
         
-        return await asyncio.get_event_loop().run_in_executor(None, _search)
+        return await asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, _search)
+    
+    async def search_songs_batch(self, queries: List[str], max_results: Optional[int] = None) -> List[List[Dict]]:
+        """
+        Run several searches concurrently (e.g. playlist import).
+        
+        Each search is a network-bound extract_info call, so they overlap on the
+        shared IO pool instead of running back to back.
+        
+        Returns:
+            One result list per query, in the same order as queries
+        """
+        return list(await asyncio.gather(
+            *(self.search_songs(query, max_results) for query in queries)
+        ))
 
+    async def get_metadata(self, video_id: str) -> Dict:
+        """
+        Get title/artist for a video without downloading it.
+        
+        The extraction is cached, so a following download_song() reuses it
+        instead of hitting YouTube again.
+        """
+        def _metadata():
+            info = self._extract_info(self._download_ydl(), video_id)
+            title = info.get('title', '')
+            artist, song_title = self._parse_title(title)
+            return {
+                'title': song_title,
+                'artist': artist,
+                'full_title': title,
+                'video_id': video_id
+            }
+        
+        return await asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, _metadata)
+    
     async def download_song(self, video_id: str) -> Tuple[str, Dict]:
         """Download original song from YouTube"""
         
         def _download():
-            import glob
+            ydl = self._download_ydl()
             
-            # Fixed output template to avoid unicode/rename issues
-            download_opts = self.ydl_opts_download.copy()
-            download_opts['outtmpl'] = os.path.join(self.audio_dir, f'{video_id}_original.%(ext)s')
-
-            with yt_dlp.YoutubeDL(download_opts) as ydl:
-                # Get video info first
-                info = ydl.extract_info(f"https://youtube.com/watch?v={video_id}", download=False)
-                title = info.get('title', '')
-                artist, song_title = self._parse_title(title)
-                
-                # Download original
-                try:
-                    ydl.download([f"https://youtube.com/watch?v={video_id}"])
-                except Exception as e:
-                    # Some videos fail with postprocessor, but file might still be downloaded
-                    print(f"Download warning: {e}")
-                
-                # Find downloaded file - check for .mp3 first, then any file with the video_id
-                target_mp3 = os.path.join(self.audio_dir, f'{video_id}_original.mp3')
-                if os.path.exists(target_mp3) and os.path.getsize(target_mp3) > 0:
-                    return target_mp3, {
-                        'title': song_title,
-                        'artist': artist,
-                        'full_title': title,
-                        'video_id': video_id
-                    }
+            # Get video info first (reused from /check when it was just fetched)
+            info = self._extract_info(ydl, video_id)
+            title = info.get('title', '')
+            artist, song_title = self._parse_title(title)
+            
+            # Download original
+            reported_file = None
+            try:
+                # Download from the info we already have instead of letting
+                # ydl.download() extract it a second time
+                result = ydl.process_ie_result(dict(info), download=True)
+                # yt-dlp reports where the (post-processed) file ended up
+                requested = result.get('requested_downloads') or [{}]
+                reported_file = requested[0].get('filepath')
+            except Exception as e:
+                # Some videos fail with postprocessor, but file might still be downloaded
+                logger.warning("Download warning: %s", e)
+            
+            # Find downloaded file - check for .wav first, then any file with the video_id
+            target_wav = os.path.join(self.download_dir, f'{video_id}_original.wav')
+            try:
+                wav_size = os.stat(target_wav).st_size
+            except FileNotFoundError:
+                wav_size = 0
+            if wav_size > 0:
+                return target_wav, {
+                    'title': song_title,
+                    'artist': artist,
+                    'full_title': title,
+                    'video_id': video_id
+                }
+            
+            # Check for other extensions (webm, m4a, etc.) but REJECT mhtml.
+            # Only look around the directory if yt-dlp couldn't tell us the path.
+            if reported_file and os.path.exists(reported_file):
+                downloaded_file = reported_file
+            else:
+                downloaded_file = self._find_download(video_id)
+            
+            if downloaded_file:
+                logger.info("Found downloaded file: %s", downloaded_file)
                 
-                # Check for other extensions (webm, m4a, etc.) but REJECT mhtml
-                pattern = os.path.join(self.audio_dir, f'{video_id}_original.*')
-                matching_files = glob.glob(pattern)
+                # Reject .mhtml files entirely - they're corrupted
+                if downloaded_file.endswith('.mhtml'):
+                    os.remove(downloaded_file)
+                    raise Exception(
+                        "Video is restricted or unavailable for download. "
+                        "This video may be region-locked, age-restricted, or have DRM protection. "
+                        "Please try a different song."
+                    )
                 
-                if matching_files:
-                    downloaded_file = matching_files[0]
-                    print(f"Found downloaded file: {downloaded_file}")
-                    
-                    # Reject .mhtml files entirely - they're corrupted
-                    if downloaded_file.endswith('.mhtml'):
-                        os.remove(downloaded_file)
-                        raise Exception(
-                            "Video is restricted or unavailable for download. "
-                            "This video may be region-locked, age-restricted, or have DRM protection. "
-                            "Please try a different song."
-                        )
-                    
-                    # If not mp3, convert it manually with ffmpeg
-                    if not downloaded_file.endswith('.mp3'):
-                        import subprocess
-                        output_mp3 = os.path.join(self.audio_dir, f'{video_id}_original.mp3')
-                        try:
-                            subprocess.run([
-                                'ffmpeg', '-i', downloaded_file,
-                                '-vn',  # No video
-                                '-ar', '44100',  # Audio sample rate
-                                '-ac', '2',  # Stereo
-                                '-b:a', '192k',  # Bitrate
-                                output_mp3
-                            ], check=True, capture_output=True)
-                            
-                            # Remove original non-mp3 file
-                            os.remove(downloaded_file)
-                            print(f"Converted to MP3: {output_mp3}")
-                            
-                            return output_mp3, {
-                                'title': song_title,
-                                'artist': artist,
-                                'full_title': title,
-                                'video_id': video_id
-                            }
-                        except Exception as conv_error:
-                            print(f"Conversion error: {conv_error}")
-                            # Clean up failed file
-                            if os.path.exists(downloaded_file):
-                                os.remove(downloaded_file)
-                            raise Exception(f"Failed to convert audio format. This video may be incompatible.")
-                    
-                    return downloaded_file, {
-                        'title': song_title,
-                        'artist': artist,
-                        'full_title': title,
-                        'video_id': video_id
-                    }
+                # If the WAV postprocessor didn't run, hand the compressed file
+                # over as-is: Demucs (AudioFile) and faster-whisper both decode
+                # any ffmpeg-readable format, so a transcode here would only add
+                # a full extra file rewrite
+                logger.info("Using downloaded file without conversion: %s", downloaded_file)
                 
-                raise Exception(f"Download failed - no valid audio file was created for this video")
+                return downloaded_file, {
+                    'title': song_title,
+                    'artist': artist,
+                    'full_title': title,
+                    'video_id': video_id
+                }
+            
+            raise Exception(f"Download failed - no valid audio file was created for this video")
+    
+        def _download_or_clean_up():
+            try:
+                return _download()
+            except Exception:
+                # The caller never gets a path to remove, so drop partial/leftover
+                # files here - in /dev/shm they would hold RAM until reboot
+                self._remove_downloads(video_id)
+                raise
         
-        return await asyncio.get_event_loop().run_in_executor(None, _download)
+        async with self._download_slots:
+            return await asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, _download_or_clean_up)
 
-    def _parse_title(self, title: str) -> Tuple[str, str]:
-        """Parse YouTube title to extract artist and song name"""
-        # Common patterns: "Artist - Song", "Artist: Song", "Song by Artist"
-        patterns = [
-            r'^(.+?)\s*-\s*(.+)$',  # Artist - Song
-            r'^(.+?)\s*:\s*(.+)$',  # Artist: Song
-            r'^(.+?)\s+by\s+(.+)$', # Song by Artist (reversed)
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, title, re.IGNORECASE)
-            if match:
-                if 'by' in pattern:
-                    return match.group(2).strip(), match.group(1).strip()  # Artist, Song
-                else:
-                    return match.group(1).strip(), match.group(2).strip()  # Artist, Song
+    def _find_download(self, video_id: str) -> Optional[str]:
+        """Find the downloaded file for a video without globbing the whole directory"""
+        prefix = f'{video_id}_original.'
+        
+        # Probe the extensions our format selection produces first
+        for ext in self.DOWNLOAD_EXTENSIONS:
+            path = os.path.join(self.download_dir, prefix + ext)
+            if os.path.exists(path):
+                return path
+        
+        # Anything else: one scandir pass with a plain prefix match, stopping at the
+        # first hit. Skip yt-dlp's partial-download leftovers; is_file() uses the
+        # type scandir already read, so it costs no extra stat
+        with os.scandir(self.download_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(prefix) and not name.endswith(('.part', '.ytdl')) and entry.is_file():
+                    return entry.path
+        return None
+    
+    def remove_download(self, path: str):
+        """Delete a downloaded file once processing no longer needs it"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Failed to remove download %s: %s", path, e)
+
+    def _shm_has_room(self) -> bool:
+        """Whether /dev/shm exists and can hold MAX_CONCURRENT_DOWNLOADS downloads"""
+        try:
+            stats = os.statvfs('/dev/shm')
+        except (OSError, AttributeError):  # missing, or no statvfs (Windows)
+            return False
+        free = stats.f_bavail * stats.f_frsize
+        needed = self.SHM_BYTES_PER_DOWNLOAD * self.MAX_CONCURRENT_DOWNLOADS
+        if free < needed:
+            logger.info("/dev/shm has %s MB free (< %s MB), downloading to disk", free >> 20, needed >> 20)
+            return False
+        return True
+    
+    def _remove_stale_downloads(self):
+        """Delete downloads a crashed worker left behind (in tmpfs they'd hold RAM until reboot)"""
+        # Only old files: other workers may be downloading into the same directory
+        cutoff = time.time() - self.STALE_DOWNLOAD_AGE
+        with os.scandir(self.download_dir) as entries:
+            for entry in entries:
+                try:
+                    if '_original.' in entry.name and entry.stat().st_mtime < cutoff:
+                        self.remove_download(entry.path)
+                except FileNotFoundError:
+                    pass
+    
+    def _remove_downloads(self, video_id: str):
+        """Delete every {video_id}_original.* file (including yt-dlp .part leftovers)"""
+        prefix = f'{video_id}_original.'
+        try:
+            with os.scandir(self.download_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix):
+                        self.remove_download(entry.path)
+        except FileNotFoundError:
+            pass
+    
+    def _search_ydl(self) -> "yt_dlp.YoutubeDL":
+        """This thread's YoutubeDL for searches, built once instead of per call"""
+        ydl = getattr(self._local, 'search_ydl', None)
+        if ydl is None:
+            ydl = self._local.search_ydl = yt_dlp.YoutubeDL(self.ydl_opts_search)
+        return ydl
+    
+    def _download_ydl(self) -> "yt_dlp.YoutubeDL":
+        """This thread's YoutubeDL for downloads (outtmpl is keyed on the video id, so it never changes)"""
+        ydl = getattr(self._local, 'download_ydl', None)
+        if ydl is None:
+            ydl = self._local.download_ydl = yt_dlp.YoutubeDL(self.ydl_opts_download)
+        return ydl
+    
+    def _extract_info(self, ydl, video_id: str) -> Dict:
+        """
+        Extract video info, reusing a recent extraction for the same video.
+        
+        Always pass the download instance: the cached info is what gets downloaded,
+        so it must come from the download options (player clients, user agent).
+        """
+        now = time.monotonic()
+        with self._info_lock:
+            entry = self._info_cache.get(video_id)
+            if entry and now - entry[0] < self.INFO_CACHE_TTL:
+                self._info_cache.move_to_end(video_id)
+                return entry[1]
+        
+        info, age = self._load_info(video_id)
+        if info is not None:
+            now -= age
+        else:
+            # process=False: just the extractor result, no format selection/sorting.
+            # The availability check doesn't need it, and the download resolves formats
+            # itself in process_ie_result - so the processing happens exactly once.
+            info = ydl.extract_info(f"https://youtube.com/watch?v={video_id}", download=False, process=False)
+            self._save_info(video_id, info)
+        
+        with self._info_lock:
+            self._info_cache[video_id] = (now, info)
+            self._info_cache.move_to_end(video_id)
+            if len(self._info_cache) > self.INFO_CACHE_SIZE:
+                self._info_cache.popitem(last=False)
+        return info
+    
+    def _load_info(self, video_id: str) -> Tuple[Optional[Dict], float]:
+        """Read a persisted extraction younger than INFO_CACHE_TTL, with its age in seconds"""
+        path = os.path.join(self.info_dir, f'{video_id}.json')
+        try:
+            age = time.time() - os.stat(path).st_mtime
+            if age >= self.INFO_CACHE_TTL:
+                os.unlink(path)
+                return None, 0
+            with open(path, 'rb') as f:
+                raw = f.read()
+            return (orjson.loads(raw) if orjson else json.loads(raw)), age
+        except FileNotFoundError:
+            return None, 0
+        except Exception as e:
+            logger.warning("Ignoring unreadable info cache %s: %s", path, e)
+            return None, 0
+    
+    def _save_info(self, video_id: str, info: Dict):
+        """Persist an extraction atomically (write to a temp file, then rename)"""
+        path = os.path.join(self.info_dir, f'{video_id}.json')
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            # Drop yt-dlp's private keys and turn non-JSON values into strings.
+            # sanitize_info setdefault()s top-level keys, so give it a copy of the
+            # dict shared with the in-memory cache
+            clean = yt_dlp.YoutubeDL.sanitize_info(dict(info), remove_private_keys=True)
+            if orjson:
+                payload = orjson.dumps(clean, default=str)
+            else:
+                payload = json.dumps(clean, default=str).encode('ascii')
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Failed to persist info for %s: %s", video_id, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        
+        self._sweep_info()
+    
+    def _sweep_info(self):
+        """Delete expired info files (at most once per INFO_CACHE_TTL), so the directory stays bounded"""
+        now = time.time()
+        with self._info_lock:
+            if now - self._last_info_sweep < self.INFO_CACHE_TTL:
+                return
+            self._last_info_sweep = now
+        
+        try:
+            with os.scandir(self.info_dir) as entries:
+                for entry in entries:
+                    try:
+                        if now - entry.stat().st_mtime >= self.INFO_CACHE_TTL:
+                            os.unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
+        except OSError as e:
+            logger.warning("Failed to sweep info cache: %s", e)
+    
+    def _search_result(self, entry: Dict) -> Dict:
+        """Build a search result from a flat yt-dlp entry"""
+        # Flat entries don't always carry every key (e.g. 'thumbnail'), so this
+        # stays .get-based rather than itemgetter; bind the method once instead
+        get = entry.get
+        
+        # Parse title to extract artist and song
+        title = get('title', '')
+        artist, song_title = self._parse_title(title)
+        
+        return {
+            'id': get('id'),
+            'title': song_title,
+            'artist': artist,
+            'duration': self._format_duration(get('duration')),
+            'thumbnail': get('thumbnail', ''),
+            'full_title': title
+        }
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_title(title: str) -> Tuple[str, str]:
+        """Parse YouTube title to extract artist and song name (memoized - titles repeat across searches)"""
+        match = YouTubeService.TITLE_RE.match(title)
+        if match:
+            if match.group('dash_song') is not None:
+                return match.group('dash_artist').strip(), match.group('dash_song').strip()  # Artist, Song
+            if match.group('colon_song') is not None:
+                return match.group('colon_artist').strip(), match.group('colon_song').strip()
+            return match.group('by_artist').strip(), match.group('by_song').strip()
         
         # If no pattern matches, return title as song with unknown artist
         return "Unknown Artist", title
@@ -235,7 +517,5 @@ class YouTubeService:
             return "Unknown"
         
         # Convert to int to handle float durations
-        duration = int(duration)
-        minutes = duration // 60
-        seconds = duration % 60
+        minutes, seconds = divmod(int(duration), 60)
         return f"{minutes}:{seconds:02d}"
@@ -100,19 +100,20 @@ const KaraokePlayer = ({ song, onBack, isProcessing, setIsProcessing }) => {
         try {
           await axios.post(`${API_BASE_URL}/process/${song.id}`);
           
-          // Poll for completion
-          const pollInterval = setInterval(async () => {
+          // Wait for the server to push the final status (Server-Sent Events)
+          const statusStream = new EventSource(`${API_BASE_URL}/status/stream/${song.id}`);
+          
+          statusStream.onmessage = async (event) => {
+            statusStream.close();
+            const status = JSON.parse(event.data);
+            
             try {
-              const statusResponse = await axios.get(`${API_BASE_URL}/status/${song.id}`);
-              
-              if (statusResponse.data.status === 'ready') {
-                clearInterval(pollInterval);
+              if (status.status === 'ready') {
                 const karaokeResponse = await axios.get(`${API_BASE_URL}/karaoke/${song.id}`);
                 setKaraokeData(karaokeResponse.data);
                 setIsProcessing(false);
-              } else if (statusResponse.data.status === 'failed' || statusResponse.data.status === 'error') {
-                clearInterval(pollInterval);
-                const errorMsg = statusResponse.data.error || statusResponse.data.message || 'Processing failed';
+              } else {
+                const errorMsg = status.error || status.message || 'Processing failed';
                 // Make error messages more user-friendly
                 let userFriendlyError = errorMsg;
                 if (errorMsg.includes('Downloaded file not found') || errorMsg.includes('downloaded file is empty')) {
@@ -125,14 +126,20 @@ const KaraokePlayer = ({ song, onBack, isProcessing, setIsProcessing }) => {
                 setError(userFriendlyError);
                 setIsProcessing(false);
               }
-            } catch (pollErr) {
-              console.error('Polling error:', pollErr);
+            } catch (fetchErr) {
+              setError(fetchErr.response?.data?.detail || 'Failed to load karaoke data');
+              setIsProcessing(false);
             }
-          }, 2000);
+          };
+          
+          statusStream.onerror = (streamErr) => {
+            // EventSource reconnects on its own
+            console.error('Status stream error:', streamErr);
+          };
           
-          // Cleanup polling after 5 minutes
+          // Give up after 5 minutes
           setTimeout(() => {
-            clearInterval(pollInterval);
+            statusStream.close();
             if (isProcessing) {
               setError('Processing timeout. Please try again.');
               setIsProcessing(false);
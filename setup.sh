@@ -60,7 +60,7 @@ cd ..
 
 # Create cache directories
 echo "📁 Creating cache directories..."
-mkdir -p cache/audio cache/metadata cache/temp_separation
+mkdir -p cache/audio cache/metadata
 
 echo ""
 echo "✅ Setup complete!"
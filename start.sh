@@ -85,6 +85,8 @@ trap cleanup SIGINT SIGTERM
 echo "🚀 Starting backend server..."
 cd backend
 source ../venv/bin/activate
+# Whisper and Demucs load at startup; set WARM_UP_MODELS=0 in .env to load
+# them on the first song instead (e.g. for a worker that only serves /search)
 python main.py &
 BACKEND_PID=$!
 cd ..
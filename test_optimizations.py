@@ -7,14 +7,18 @@ import sys
 import os
 import time
 import asyncio
+import logging
+
+import torch
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 from services.whisper_service import WhisperService
 from services.audio_separation_service import AudioSeparationService
+from services.executors import IO_EXECUTOR
 
-async def test_whisper():
+async def test_whisper(device_gate: asyncio.Semaphore):
     """Test faster-whisper integration"""
     print("\n" + "="*80)
     print("🎤 Testing faster-whisper Transcription")
@@ -30,13 +34,14 @@ async def test_whisper():
     whisper_service = WhisperService()
     
     try:
-        print(f"📝 Transcribing: {test_audio}")
-        start_time = time.time()
-        
-        # Transcribe just the first 30 seconds for testing
-        words = await whisper_service.transcribe_with_timestamps(test_audio)
-        
-        elapsed = time.time() - start_time
+        async with device_gate:
+            print(f"📝 Transcribing: {test_audio}")
+            start_time = time.perf_counter()
+            
+            # Transcribe just the first 30 seconds for testing
+            words = await whisper_service.transcribe_with_timestamps(test_audio)
+            
+            elapsed = time.perf_counter() - start_time
         
         print(f"\n✅ Transcription successful!")
         print(f"⏱️  Time: {elapsed:.2f} seconds")
@@ -50,10 +55,10 @@ async def test_whisper():
         traceback.print_exc()
         return False
 
-async def test_separation():
-    """Test mdx_extra audio separation"""
+async def test_separation(device_gate: asyncio.Semaphore):
+    """Test mdx_extra_q audio separation"""
     print("\n" + "="*80)
-    print("🎵 Testing mdx_extra Audio Separation")
+    print("🎵 Testing mdx_extra_q Audio Separation")
     print("="*80 + "\n")
     
     # Use a short test file
@@ -64,19 +69,21 @@ async def test_separation():
         print(f"❌ Test audio file not found: {test_audio}")
         return False
     
-    separation_service = AudioSeparationService()
-    
     try:
-        print(f"🎚️  Separating audio: {test_audio}")
-        print(f"   Using mdx_extra model (optimized for speed)")
-        start_time = time.time()
-        
-        vocals_path, instrumental_path = await separation_service.separate_audio(
-            test_audio,
-            test_video_id
-        )
+        # Loading the weights blocks, so keep it off the event loop
+        separation_service = await asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, AudioSeparationService)
         
-        elapsed = time.time() - start_time
+        async with device_gate:
+            print(f"🎚️  Separating audio: {test_audio}")
+            print(f"   Using mdx_extra_q model (optimized for speed)")
+            start_time = time.perf_counter()
+            
+            vocals_path, instrumental_path = await separation_service.separate_audio(
+                test_audio,
+                test_video_id
+            )
+            
+            elapsed = time.perf_counter() - start_time
         
         print(f"\n✅ Separation successful!")
         print(f"⏱️  Time: {elapsed:.2f} seconds ({elapsed/60:.1f} minutes)")
@@ -113,20 +120,23 @@ async def main():
     print("  2. ✅ Using base model instead of medium (faster)")
     print("  3. ✅ Using int8 quantization for CPU optimization")
     print("  4. ✅ Switched from htdemucs to mdx_extra (3-4x faster)")
-    print("  5. ✅ Using --int24 flag for faster audio processing")
-    
-    # Test whisper
-    whisper_ok = await test_whisper()
+    print("  5. ✅ Using quantized mdx_extra_q weights with shifts=0")
     
-    # Test separation
-    separation_ok = await test_separation()
+    # Whisper and separation use different models and write disjoint outputs,
+    # so run them concurrently. Without a GPU, torch (Demucs) and CTranslate2
+    # (Whisper) each spread over every core, so the timed sections take turns
+    device_gate = asyncio.Semaphore(2 if torch.cuda.is_available() else 1)
+    whisper_ok, separation_ok = await asyncio.gather(
+        test_whisper(device_gate),
+        test_separation(device_gate)
+    )
     
     # Summary
     print("\n" + "="*80)
     print("📊 TEST SUMMARY")
     print("="*80)
     print(f"  Whisper (faster-whisper): {'✅ PASSED' if whisper_ok else '❌ FAILED'}")
-    print(f"  Audio Separation (mdx_extra): {'✅ PASSED' if separation_ok else '❌ FAILED'}")
+    print(f"  Audio Separation (mdx_extra_q): {'✅ PASSED' if separation_ok else '❌ FAILED'}")
     
     if whisper_ok and separation_ok:
         print("\n🎉 All tests passed! Your karaoke app is now MUCH faster!")
@@ -140,6 +150,8 @@ async def main():
     return whisper_ok and separation_ok
 
 if __name__ == "__main__":
+    # Show service logs (model loading, per-stage progress)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     success = asyncio.run(main())
     sys.exit(0 if success else 1)
 